@@ -0,0 +1,314 @@
+//! Ed25519 FFI for the Python crypto helpers
+//!
+//! Provides a pyo3 module for:
+//! - Single signature verification (ed25519-dalek)
+//! - Batch verification of Ed25519 signatures (ed25519-consensus)
+
+use curve25519_dalek::edwards::CompressedEdwardsY;
+use curve25519_dalek::scalar::Scalar;
+use ed25519_consensus::{batch, Signature, VerificationKeyBytes};
+use pyo3::create_exception;
+use pyo3::exceptions::{PyException, PyValueError};
+use pyo3::prelude::*;
+use pyo3::types::PyBytes;
+use rand_core::OsRng;
+
+create_exception!(ed25519_ffi, BadSignatureError, PyException);
+
+/// Ed25519 public key, mirrors ed25519_dalek::VerifyingKey
+#[pyclass(frozen)]
+struct VerifyingKey {
+    inner: ed25519_dalek::VerifyingKey,
+}
+
+#[pymethods]
+impl VerifyingKey {
+    /// Decode a 32-byte compressed public key
+    #[staticmethod]
+    fn from_bytes(public_key: &[u8]) -> PyResult<Self> {
+        let bytes: [u8; 32] = public_key
+            .try_into()
+            .map_err(|_| PyValueError::new_err("public key must be 32 bytes"))?;
+        let inner = ed25519_dalek::VerifyingKey::from_bytes(&bytes)
+            .map_err(|e| PyValueError::new_err(e.to_string()))?;
+        Ok(Self { inner })
+    }
+
+    /// Verify a signature, raising BadSignatureError on failure
+    ///
+    /// The GIL is released while verifying.
+    fn verify_strict(&self, py: Python<'_>, message: &[u8], signature: &[u8]) -> PyResult<()> {
+        let signature = ed25519_dalek::Signature::from_slice(signature)
+            .map_err(|e| BadSignatureError::new_err(e.to_string()))?;
+        py.allow_threads(|| self.inner.verify_strict(message, &signature))
+            .map_err(|e| BadSignatureError::new_err(e.to_string()))
+    }
+}
+
+/// (public_key, message, signature)
+type Entry<'a> = (&'a [u8], &'a [u8], &'a [u8]);
+
+/// An entry that passed the strict pre-checks and can be queued in a batch
+struct Queued<'a> {
+    vk_bytes: VerificationKeyBytes,
+    signature: Signature,
+    entry: Entry<'a>,
+}
+
+/// Verify a single entry with the same rules as `VerifyingKey.verify_strict`
+fn verify_strict(entry: &Entry) -> bool {
+    let (public_key, message, signature) = *entry;
+    let Ok(public_key) = <[u8; 32]>::try_from(public_key) else {
+        return false;
+    };
+    let Ok(signature) = ed25519_dalek::Signature::from_slice(signature) else {
+        return false;
+    };
+    ed25519_dalek::VerifyingKey::from_bytes(&public_key)
+        .and_then(|vk| vk.verify_strict(message, &signature))
+        .is_ok()
+}
+
+/// Canonically encoded point in the prime-order subgroup, other than the identity
+///
+/// Torsion-freeness costs a scalar multiplication, but without it a point
+/// with an 8-torsion component passes the cofactored batch equation while
+/// failing the cofactorless one used by verify_strict.
+fn is_strict_point(bytes: &[u8; 32]) -> bool {
+    CompressedEdwardsY(*bytes).decompress().is_some_and(|p| {
+        !p.is_small_order() && p.is_torsion_free() && p.compress().as_bytes() == bytes
+    })
+}
+
+/// Check an entry against the strict rules before it may be batched
+///
+/// The batch equation follows ZIP-215, which accepts small-order, mixed-order
+/// and non-canonically encoded A and R that verify_strict (and libsodium)
+/// reject. Only entries with canonical, prime-order A and R and a canonical s
+/// are queued, for which the cofactored and cofactorless equations agree;
+/// everything else is decided by `verify_strict` alone.
+fn queue_entry<'a>(entry: Entry<'a>) -> Option<Queued<'a>> {
+    let (public_key, _, signature) = entry;
+    let public_key: [u8; 32] = public_key.try_into().ok()?;
+    let signature: [u8; 64] = signature.try_into().ok()?;
+    let r: [u8; 32] = signature[..32].try_into().ok()?;
+    let s: [u8; 32] = signature[32..].try_into().ok()?;
+
+    if !is_strict_point(&public_key)
+        || !is_strict_point(&r)
+        || !bool::from(Scalar::from_canonical_bytes(s).is_some())
+    {
+        return None;
+    }
+    Some(Queued {
+        vk_bytes: VerificationKeyBytes::from(public_key),
+        signature: Signature::from(signature),
+        entry,
+    })
+}
+
+/// Verify `queued` as a single batch, bisecting on failure
+///
+/// A failing batch is split in half and each half re-verified until the
+/// invalid signatures are isolated, so a single bad entry costs O(log n)
+/// extra batch checks rather than n single verifications.
+fn verify_range(queued: &[Queued], results: &mut [bool]) {
+    match queued.len() {
+        0 => return,
+        1 => {
+            results[0] = verify_strict(&queued[0].entry);
+            return;
+        }
+        _ => {}
+    }
+
+    let mut verifier = batch::Verifier::new();
+    for item in queued {
+        verifier.queue((item.vk_bytes, item.signature, item.entry.1));
+    }
+    if verifier.verify(OsRng).is_ok() {
+        results.fill(true);
+        return;
+    }
+
+    let mid = queued.len() / 2;
+    let (left, right) = queued.split_at(mid);
+    let (left_results, right_results) = results.split_at_mut(mid);
+    verify_range(left, left_results);
+    verify_range(right, right_results);
+}
+
+/// Verify entries, batching those that pass the strict pre-checks
+fn verify_entries(entries: &[Entry]) -> Vec<bool> {
+    let mut results = vec![false; entries.len()];
+    let mut queued = Vec::with_capacity(entries.len());
+    let mut indices = Vec::with_capacity(entries.len());
+    for (i, &entry) in entries.iter().enumerate() {
+        match queue_entry(entry) {
+            Some(item) => {
+                queued.push(item);
+                indices.push(i);
+            }
+            None => results[i] = verify_strict(&entry),
+        }
+    }
+
+    let mut queued_results = vec![false; queued.len()];
+    verify_range(&queued, &mut queued_results);
+    for (i, ok) in indices.into_iter().zip(queued_results) {
+        results[i] = ok;
+    }
+    results
+}
+
+/// Verify a batch of Ed25519 signatures
+///
+/// # Arguments
+/// * `items` - List of (public_key, message, signature) byte tuples
+///
+/// # Returns
+/// List of booleans, one per item
+///
+/// The GIL is released while verifying.
+#[pyfunction]
+fn batch_verify<'py>(
+    py: Python<'py>,
+    items: Vec<(Bound<'py, PyBytes>, Bound<'py, PyBytes>, Bound<'py, PyBytes>)>,
+) -> Vec<bool> {
+    let entries: Vec<Entry> = items
+        .iter()
+        .map(|(pk, msg, sig)| (pk.as_bytes(), msg.as_bytes(), sig.as_bytes()))
+        .collect();
+    py.allow_threads(|| verify_entries(&entries))
+}
+
+#[pymodule]
+fn ed25519_ffi(m: &Bound<'_, PyModule>) -> PyResult<()> {
+    m.add_class::<VerifyingKey>()?;
+    m.add("BadSignatureError", m.py().get_type_bound::<BadSignatureError>())?;
+    m.add_function(wrap_pyfunction!(batch_verify, m)?)?;
+    Ok(())
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use curve25519_dalek::constants::{ED25519_BASEPOINT_COMPRESSED, ED25519_BASEPOINT_POINT};
+    use curve25519_dalek::edwards::EdwardsPoint;
+    use ed25519_consensus::VerificationKey;
+    use ed25519_dalek::{Signer, SigningKey};
+    use sha2::{Digest, Sha512};
+
+    const MESSAGE: &[u8] = b"romio";
+
+    /// A point of order 8
+    const TORSION: [u8; 32] = [
+        0x26, 0xe8, 0x95, 0x8f, 0xc2, 0xb2, 0x27, 0xb0, 0x45, 0xc3, 0xf4, 0x89, 0xf2, 0xef, 0x98,
+        0xf0, 0xd5, 0xdf, 0xac, 0x05, 0xd3, 0xc6, 0x33, 0x39, 0xb1, 0x38, 0x02, 0x88, 0x6d, 0x53,
+        0xfc, 0x05,
+    ];
+
+    fn signed(seed: u8) -> ([u8; 32], [u8; 64]) {
+        let key = SigningKey::from_bytes(&[seed; 32]);
+        (key.verifying_key().to_bytes(), key.sign(MESSAGE).to_bytes())
+    }
+
+    /// Identity public key with R = B, s = 1
+    ///
+    /// Valid under ZIP-215 for any message, rejected by verify_strict.
+    fn small_order_key() -> ([u8; 32], [u8; 64]) {
+        let mut public_key = [0u8; 32];
+        public_key[0] = 1;
+        let mut signature = [0u8; 64];
+        signature[..32].copy_from_slice(ED25519_BASEPOINT_COMPRESSED.as_bytes());
+        signature[32] = 1;
+        (public_key, signature)
+    }
+
+    /// Sign MESSAGE with A = aB (+ T) and R = rB (+ T), T of order 8
+    ///
+    /// Valid under the cofactored ZIP-215 equation, rejected by verify_strict.
+    fn mixed_order(torsion_in_key: bool) -> ([u8; 32], [u8; 64]) {
+        let torsion = CompressedEdwardsY(TORSION).decompress().unwrap();
+        let (a, r) = (Scalar::from(7u64), Scalar::from(11u64));
+        let mut key_point = a * ED25519_BASEPOINT_POINT;
+        let mut nonce_point: EdwardsPoint = r * ED25519_BASEPOINT_POINT;
+        if torsion_in_key {
+            key_point += torsion;
+        } else {
+            nonce_point += torsion;
+        }
+
+        let public_key = key_point.compress().to_bytes();
+        let nonce = nonce_point.compress().to_bytes();
+        let k = Scalar::from_hash(
+            Sha512::new()
+                .chain_update(nonce)
+                .chain_update(public_key)
+                .chain_update(MESSAGE),
+        );
+        let mut signature = [0u8; 64];
+        signature[..32].copy_from_slice(&nonce);
+        signature[32..].copy_from_slice((r + k * a).as_bytes());
+        (public_key, signature)
+    }
+
+    #[test]
+    fn mixed_order_points_agree_with_verify_strict() {
+        let (pk_a, sig_a) = signed(1);
+        for torsion_in_key in [false, true] {
+            let (pk, sig) = mixed_order(torsion_in_key);
+            let vk = VerificationKey::try_from(VerificationKeyBytes::from(pk)).unwrap();
+            assert!(vk.verify(&Signature::from(sig), MESSAGE).is_ok());
+
+            assert!(!verify_strict(&(&pk[..], MESSAGE, &sig[..])));
+            assert!(queue_entry((&pk[..], MESSAGE, &sig[..])).is_none());
+
+            let entries = [
+                (&pk_a[..], MESSAGE, &sig_a[..]),
+                (&pk[..], MESSAGE, &sig[..]),
+                (&pk[..], MESSAGE, &sig[..]),
+            ];
+            assert_eq!(verify_entries(&entries), vec![true, false, false]);
+        }
+    }
+
+    #[test]
+    fn small_order_key_agrees_with_verify_strict() {
+        let (pk, sig) = small_order_key();
+        let vk = VerificationKey::try_from(VerificationKeyBytes::from(pk)).unwrap();
+        assert!(vk.verify(&Signature::from(sig), MESSAGE).is_ok());
+
+        assert!(!verify_strict(&(&pk[..], MESSAGE, &sig[..])));
+        assert!(queue_entry((&pk[..], MESSAGE, &sig[..])).is_none());
+
+        let (pk_a, sig_a) = signed(1);
+        let (pk_b, sig_b) = signed(2);
+        let entries = [
+            (&pk_a[..], MESSAGE, &sig_a[..]),
+            (&pk[..], MESSAGE, &sig[..]),
+            (&pk_b[..], MESSAGE, &sig_b[..]),
+        ];
+        assert_eq!(verify_entries(&entries), vec![true, false, true]);
+        assert_eq!(verify_entries(&entries[1..2]), vec![false]);
+    }
+
+    #[test]
+    fn bisection_isolates_invalid_signatures() {
+        let keys: Vec<_> = (1..=8).map(signed).collect();
+        let mut tampered = keys[5].1;
+        tampered[40] ^= 1;
+        let short_key = [0u8; 31];
+
+        let mut entries: Vec<Entry> = keys
+            .iter()
+            .map(|(pk, sig)| (&pk[..], MESSAGE, &sig[..]))
+            .collect();
+        entries[5].2 = &tampered[..];
+        entries[2].1 = &b"other"[..];
+        entries.push((&short_key[..], MESSAGE, &keys[0].1[..]));
+
+        let expected: Vec<bool> = (0..entries.len()).map(|i| ![2, 5, 8].contains(&i)).collect();
+        assert_eq!(verify_entries(&entries), expected);
+    }
+}
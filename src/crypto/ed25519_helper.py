@@ -1,12 +1,77 @@
 #!/usr/bin/env python3
 """
 Ed25519 signature verification helper.
-Uses PyNaCl (libsodium) for Ed25519 operations.
+Uses ed25519-dalek via the ed25519-ffi extension (deps/ed25519-ffi, built by
+`make deps`).
 """
+import os
 import sys
 import json
-from nacl.signing import VerifyKey
-from nacl.exceptions import BadSignatureError
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import msgspec
+from ed25519_ffi import VerifyingKey, BadSignatureError
+from ed25519_ffi import batch_verify as _native_batch_verify
+
+DAEMON_SOCKET_PATH = "/tmp/romio_ed25519.sock"
+
+# Binary batch frame:
+#   [u8 cmd][u32 count]
+#   count x [u8 pk_len][pk][u32 msg_len][msg][u8 sig_len][sig]
+# All integers little-endian.
+CMD_BATCH_VERIFY = 0x01
+
+# Below this many signatures one native batch beats thread pool overhead;
+# also the minimum chunk size when splitting a batch across cores
+PARALLEL_THRESHOLD = 16
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class VerifyRequest(msgspec.Struct):
+    """One entry of a msgpack batch_verify request (raw bytes, no hex)."""
+    public_key: bytes
+    message: bytes
+    signature: bytes
+
+
+@lru_cache(maxsize=4096)
+def _verifying_key(public_key: bytes) -> VerifyingKey:
+    """Decode a public key, cached since validator keys recur across messages."""
+    return VerifyingKey.from_bytes(public_key)
+
+
+def verify_ed25519_bytes(public_key: bytes, message: bytes, signature: bytes) -> bool:
+    """
+    Verify an Ed25519 signature over raw bytes.
+
+    Args:
+        public_key: 32-byte public key
+        message: Message bytes
+        signature: 64-byte signature
+
+    Returns:
+        True if signature is valid, False otherwise
+    """
+    # Reject malformed lengths before touching the key or curve
+    if len(public_key) != 32 or len(signature) != 64:
+        return False
+
+    try:
+        # Look up (or decode) the verify key for these public key bytes
+        verify_key = _verifying_key(bytes(public_key))
+
+        # Verify signature (raises BadSignatureError on failure)
+        verify_key.verify_strict(message, signature)
+        return True
+    except BadSignatureError:
+        return False
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return False
 
 
 def verify_ed25519(public_key_hex: str, message_hex: str, signature_hex: str) -> bool:
@@ -21,31 +86,23 @@ def verify_ed25519(public_key_hex: str, message_hex: str, signature_hex: str) ->
     Returns:
         True if signature is valid, False otherwise
     """
-    # Remove 0x prefix if present
-    if public_key_hex.startswith("0x"):
-        public_key_hex = public_key_hex[2:]
-    if message_hex.startswith("0x"):
-        message_hex = message_hex[2:]
-    if signature_hex.startswith("0x"):
-        signature_hex = signature_hex[2:]
+    public_key_hex = _strip0x(public_key_hex)
+    signature_hex = _strip0x(signature_hex)
+
+    # Reject malformed lengths before decoding
+    if len(public_key_hex) != 64 or len(signature_hex) != 128:
+        return False
 
     try:
         public_key = bytes.fromhex(public_key_hex)
-        message = bytes.fromhex(message_hex)
+        message = bytes.fromhex(_strip0x(message_hex))
         signature = bytes.fromhex(signature_hex)
-
-        # Create verify key from public key bytes
-        verify_key = VerifyKey(public_key)
-
-        # Verify signature (raises BadSignature on failure)
-        verify_key.verify(message, signature)
-        return True
-    except BadSignatureError:
-        return False
-    except Exception as e:
+    except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
         return False
 
+    return verify_ed25519_bytes(public_key, message, signature)
+
 
 def batch_verify(verifications: list) -> list:
     """
@@ -57,19 +114,144 @@ def batch_verify(verifications: list) -> list:
     Returns:
         List of boolean results
     """
-    results = []
+    # Decode once, then verify the whole batch in a single multiscalar mult
+    items = []
+    append = items.append
+    decode = _decode_hex
     for v in verifications:
-        result = verify_ed25519(v["public_key"], v["message"], v["signature"])
-        results.append(result)
+        try:
+            append((decode(v["public_key"]), decode(v["message"]), decode(v["signature"])))
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            # Empty key/signature is rejected by the native verifier
+            append((b"", b"", b""))
+    return _verify_items(items)
+
+
+def batch_verify_bytes(items: list) -> list:
+    """
+    Verify a batch of Ed25519 signatures over raw bytes.
+
+    Args:
+        items: List of (public_key, message, signature) byte sequences
+
+    Returns:
+        List of boolean results
+    """
+    return _verify_items([tuple(item) for item in items])
+
+
+def parse_batch_frame(frame: bytes) -> list:
+    """
+    Parse a binary batch verification frame.
+
+    Args:
+        frame: Frame bytes (see CMD_BATCH_VERIFY)
+
+    Returns:
+        List of (public_key, message, signature) byte tuples
+
+    Raises:
+        ValueError: If the command byte is wrong, the frame is truncated or
+            bytes follow the last entry
+    """
+    try:
+        cmd, count = struct.unpack_from('<BI', frame, 0)
+        if cmd != CMD_BATCH_VERIFY:
+            raise ValueError(f"Unexpected frame command: 0x{cmd:02x}")
+
+        items = []
+        pos = 5
+        for _ in range(count):
+            pk_len = frame[pos]
+            pos += 1
+            public_key = frame[pos:pos + pk_len]
+            pos += pk_len
+            msg_len = struct.unpack_from('<I', frame, pos)[0]
+            pos += 4
+            message = frame[pos:pos + msg_len]
+            pos += msg_len
+            sig_len = frame[pos]
+            pos += 1
+            signature = frame[pos:pos + sig_len]
+            pos += sig_len
+            items.append((public_key, message, signature))
+    except (IndexError, struct.error):
+        raise ValueError("Truncated batch frame")
+
+    if pos > len(frame):
+        raise ValueError("Truncated batch frame")
+    if pos != len(frame):
+        raise ValueError(f"Trailing bytes after batch frame: {len(frame) - pos}")
+    return items
+
+
+def batch_verify_binary(frame: bytes) -> list:
+    """
+    Verify a binary batch verification frame.
+
+    Args:
+        frame: Frame bytes (see CMD_BATCH_VERIFY)
+
+    Returns:
+        List of boolean results
+    """
+    return _verify_items(parse_batch_frame(bytes(frame)))
+
+
+def _verify_items(items: list) -> list:
+    """
+    Verify decoded (public_key, message, signature) tuples.
+
+    Large batches are split evenly into at most one chunk per core, each at
+    least PARALLEL_THRESHOLD long, and verified in parallel; the native
+    verifier releases the GIL.
+    """
+    n_chunks = min(os.cpu_count() or 1, len(items) // PARALLEL_THRESHOLD)
+    if n_chunks <= 1:
+        return _native_batch_verify(items)
+
+    size, extra = divmod(len(items), n_chunks)
+    chunks = []
+    start = 0
+    for i in range(n_chunks):
+        end = start + size + (i < extra)
+        chunks.append(items[start:end])
+        start = end
+
+    results = []
+    for chunk_results in _get_executor().map(_native_batch_verify, chunks):
+        results.extend(chunk_results)
     return results
 
 
+def _get_executor() -> ThreadPoolExecutor:
+    """Shared verification pool, created on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+        return _executor
+
+
+def _strip0x(value: str) -> str:
+    """Remove 0x prefix if present."""
+    return value[2:] if value[:2] == "0x" else value
+
+
+def _decode_hex(value: str) -> bytes:
+    """Decode a hex string with or without 0x prefix."""
+    return bytes.fromhex(_strip0x(value))
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: ed25519_helper.py <command> [args...]", file=sys.stderr)
         print("Commands:", file=sys.stderr)
         print("  verify <public_key_hex> <message_hex> <signature_hex>", file=sys.stderr)
-        print("  batch_verify  (reads JSON from stdin)", file=sys.stderr)
+        print("  batch_verify [--json]  (reads msgpack, or JSON with --json, from stdin)", file=sys.stderr)
+        print("  batch_verify_binary  (reads binary frame from stdin, writes one byte per result)", file=sys.stderr)
+        print(f"  daemon [socket_path]  (default {DAEMON_SOCKET_PATH})", file=sys.stderr)
         sys.exit(1)
 
     command = sys.argv[1]
@@ -86,10 +268,32 @@ if __name__ == "__main__":
         print("true" if result else "false")
 
     elif command == "batch_verify":
-        # Read verification data from stdin (JSON array)
-        data = json.loads(sys.stdin.read())
-        results = batch_verify(data)
-        print(json.dumps(results))
+        if "--json" in sys.argv[2:]:
+            # Read verification data from stdin (JSON array of hex strings)
+            data = json.loads(sys.stdin.read())
+            results = batch_verify(data)
+        else:
+            # Read verification data from stdin (msgpack array of raw bytes)
+            requests = msgspec.msgpack.decode(sys.stdin.buffer.read(), type=list[VerifyRequest])
+            results = batch_verify_bytes([(r.public_key, r.message, r.signature) for r in requests])
+        sys.stdout.buffer.write(msgspec.json.encode(results) + b"\n")
+
+    elif command == "batch_verify_binary":
+        results = batch_verify_binary(sys.stdin.buffer.read())
+        sys.stdout.buffer.write(bytes(results))
+
+    elif command == "daemon":
+        from helper_daemon import serve
+        socket_path = sys.argv[2] if len(sys.argv) > 2 else DAEMON_SOCKET_PATH
+        try:
+            serve({
+                "verify": verify_ed25519_bytes,
+                "batch_verify": batch_verify_bytes,
+                "batch_verify_binary": batch_verify_binary,
+            }, socket_path)
+        except RuntimeError as e:
+            print(str(e), file=sys.stderr)
+            sys.exit(1)
 
     else:
         print(f"Unknown command: {command}", file=sys.stderr)
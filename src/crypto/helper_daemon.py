@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Unix-domain socket daemon shared by the crypto helpers.
+Keeps one interpreter (and its imported crypto libraries) alive across requests.
+
+Each frame is a u32 little-endian length, a u32 request ID and a msgpack
+payload (the length covers the ID and payload):
+    request:  [command, *args]      (byte arguments are sent raw, not hex)
+    response: {"ok": result} or {"error": message}
+
+Requests on a connection are handed to a thread pool as they arrive and
+responses are written back as they complete, tagged with the request ID,
+so clients should expect them out of order.
+"""
+import asyncio
+import os
+import socket
+import stat
+import struct
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import msgspec
+
+# Maximum number of outstanding requests per connection
+MAX_IN_FLIGHT = 256
+
+# Maximum frame length (request ID + payload) accepted from a client
+MAX_FRAME = 64 * 1024 * 1024
+
+HEADER = struct.Struct('<II')
+
+_encoder = msgspec.msgpack.Encoder()
+_decoder = msgspec.msgpack.Decoder()
+
+
+def dispatch(handlers: dict, request) -> dict:
+    """
+    Run a single decoded request against the handler table.
+
+    Args:
+        handlers: Map of command name to callable
+        request: Decoded [command, *args] array
+
+    Returns:
+        {"ok": result} or {"error": message}
+    """
+    try:
+        command, *args = request
+        handler = handlers.get(command)
+        if handler is None:
+            return {"error": f"Unknown command: {command}"}
+        return {"ok": handler(*args)}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def respond(handlers: dict, request) -> bytes:
+    """
+    Dispatch a request and encode its response frame payload.
+
+    A result that cannot be encoded is reported as an error, so every request
+    gets exactly one response.
+    """
+    try:
+        return _encoder.encode(dispatch(handlers, request))
+    except Exception as e:
+        return _encoder.encode({"error": f"Unencodable result: {e}"})
+
+
+async def _serve_connection(reader, writer, handlers: dict, executor):
+    """Read requests from one connection and write back completions."""
+    loop = asyncio.get_running_loop()
+    completions = asyncio.Queue()
+    in_flight = asyncio.Semaphore(MAX_IN_FLIGHT)
+    pending = set()
+
+    async def submit(request_id, frame):
+        try:
+            try:
+                request = _decoder.decode(frame)
+            except msgspec.DecodeError as e:
+                payload = _encoder.encode({"error": f"Invalid frame: {e}"})
+            else:
+                payload = await loop.run_in_executor(executor, respond, handlers, request)
+            await completions.put((request_id, payload))
+        finally:
+            in_flight.release()
+
+    async def complete():
+        # Write every completion that is ready, then drain once
+        while True:
+            item = await completions.get()
+            while item is not None:
+                request_id, payload = item
+                writer.write(HEADER.pack(4 + len(payload), request_id))
+                writer.write(payload)
+                if completions.empty():
+                    break
+                item = completions.get_nowait()
+            await writer.drain()
+            if item is None:
+                return
+
+    writer_task = asyncio.create_task(complete())
+    try:
+        while True:
+            try:
+                msg_len, request_id = HEADER.unpack(await reader.readexactly(HEADER.size))
+                if not 4 <= msg_len <= MAX_FRAME:
+                    # The stream cannot be resynchronised: report and hang up
+                    error = {"error": f"Invalid frame length: {msg_len}"}
+                    await completions.put((request_id, _encoder.encode(error)))
+                    break
+                frame = await reader.readexactly(msg_len - 4)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+
+            await in_flight.acquire()
+            task = asyncio.create_task(submit(request_id, frame))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+        await asyncio.gather(*pending)
+        await completions.put(None)
+        await writer_task
+    except ConnectionError:
+        pass
+    finally:
+        for task in pending:
+            task.cancel()
+        writer_task.cancel()
+        writer.close()
+
+
+def _remove_stale_socket(socket_path: str):
+    """
+    Remove a socket left behind by a daemon that is no longer running.
+
+    Raises:
+        RuntimeError: If the path is not a socket or a daemon still accepts
+            connections on it
+    """
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise RuntimeError(f"Refusing to replace non-socket {socket_path}")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            pass
+        else:
+            raise RuntimeError(f"A daemon is already listening on {socket_path}")
+    os.unlink(socket_path)
+
+
+def serve(handlers: dict, socket_path: str, max_workers: int = None):
+    """
+    Serve requests on a Unix-domain socket until interrupted.
+
+    The socket is only accessible to the current user.
+
+    Args:
+        handlers: Map of command name to callable
+        socket_path: Filesystem path to bind
+        max_workers: Thread pool size (default: CPU count)
+
+    Raises:
+        RuntimeError: If another daemon is serving socket_path, or the path
+            exists and is not a socket
+    """
+    _remove_stale_socket(socket_path)
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            # Bind with a restrictive umask so the socket is created 0600
+            umask = os.umask(0o177)
+            try:
+                server = await asyncio.start_unix_server(
+                    lambda r, w: _serve_connection(r, w, handlers, executor),
+                    path=socket_path,
+                )
+            finally:
+                os.umask(umask)
+            print(f"Listening on {socket_path}", file=sys.stderr)
+            async with server:
+                await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
@@ -5,8 +5,57 @@ Uses the jam-vrf library for Bandersnatch VRF operations.
 """
 import sys
 import json
+from functools import lru_cache
+import msgspec
 import jam_vrf
 
+DAEMON_SOCKET_PATH = "/tmp/romio_vrf.sock"
+
+
+class TicketRequest(msgspec.Struct):
+    """One ticket of a msgpack batch_verify request."""
+    attempt: int
+    signature: bytes
+
+
+class TicketBatchRequest(msgspec.Struct):
+    """msgpack batch_verify request (raw bytes, no hex)."""
+    commitment: bytes
+    ring_size: int
+    entropy: bytes
+    tickets: list[TicketRequest]
+
+
+def _strip0x(value: str) -> str:
+    """Remove 0x prefix if present."""
+    return value[2:] if value[:2] == "0x" else value
+
+
+@lru_cache(maxsize=8)
+def _ring_verifier(commitment: bytes, ring_size: int):
+    """Build a ring verifier, cached since ring setup dominates verification cost."""
+    return jam_vrf.RingVerifier(commitment, ring_size)
+
+
+def compute_ticket_id_bytes(signature: bytes) -> bytes:
+    """
+    Compute the ticket ID from a raw ring VRF signature.
+
+    Args:
+        signature: Signature bytes (VRF output point in the first 32 bytes)
+
+    Returns:
+        32-byte ticket ID
+    """
+    return _ticket_id(bytes(signature[:32]))
+
+
+@lru_cache(maxsize=16384)
+def _ticket_id(vrf_output: bytes) -> bytes:
+    """Hash a VRF output point to a ticket ID, cached since signatures recur in replays."""
+    return jam_vrf.VRFOutput(vrf_output).hash()[:32]
+
+
 def compute_ticket_id(signature_hex: str) -> str:
     """
     Compute the ticket ID from a ring VRF signature.
@@ -17,21 +66,112 @@ def compute_ticket_id(signature_hex: str) -> str:
     Returns:
         Hex string of the 32-byte ticket ID
     """
-    # Remove 0x prefix if present
-    if signature_hex.startswith("0x"):
-        signature_hex = signature_hex[2:]
+    return compute_ticket_id_bytes(bytes.fromhex(_strip0x(signature_hex))).hex()
+
+
+def verify_ring_signature_bytes(
+    commitment: bytes,
+    ring_size: int,
+    entropy: bytes,
+    attempt: int,
+    signature: bytes
+) -> bytes:
+    """
+    Verify a raw ring VRF signature for a Safrole ticket.
+
+    Args:
+        commitment: Ring commitment (gamma_z from state)
+        ring_size: Number of validators in ring
+        entropy: Epoch entropy (eta_2)
+        attempt: Ticket attempt number (0, 1, or 2)
+        signature: Ring VRF signature
 
-    sig_bytes = bytes.fromhex(signature_hex)
+    Returns:
+        32-byte ticket ID
 
-    # Extract VRF output point (first 32 bytes)
-    vrf_output_bytes = sig_bytes[:32]
+    Raises:
+        Exception: If the commitment or signature is invalid
+    """
+    # Construct VRF input: "jam_ticket_seal" + entropy + attempt
+    data = b"jam_ticket_seal" + entropy + bytes([attempt])
 
-    # Compute hash (ticket ID)
-    vrf_output = jam_vrf.VRFOutput(vrf_output_bytes)
-    ticket_id_full = vrf_output.hash()
+    verifier = _ring_verifier(bytes(commitment), ring_size)
+    verifier.verify([(data, b"", signature)])
+    return compute_ticket_id_bytes(signature)
 
-    # Return first 32 bytes as hex
-    return ticket_id_full[:32].hex()
+
+def batch_verify_tickets(
+    commitment: bytes,
+    ring_size: int,
+    entropy: bytes,
+    tickets: list
+) -> list:
+    """
+    Verify a batch of raw ring VRF ticket signatures against one ring.
+
+    Args:
+        commitment: Ring commitment (gamma_z from state)
+        ring_size: Number of validators in ring
+        entropy: Epoch entropy (eta_2)
+        tickets: List of (attempt, signature) pairs
+
+    Returns:
+        List of {"ok": ticket_id_bytes} or {"error": message}
+    """
+    # Create verifier
+    try:
+        verifier = _ring_verifier(bytes(commitment), ring_size)
+    except Exception as e:
+        # Invalid commitment - all tickets fail
+        return [{"error": f"Invalid commitment: {e}"} for _ in tickets]
+
+    # Construct VRF input: "jam_ticket_seal" + entropy + attempt
+    # Only the attempt byte varies, so build each distinct input once
+    prefix = b"jam_ticket_seal" + entropy
+    vrf_data_by_attempt = {}
+
+    items = []
+    append = items.append
+    cached_vrf_data = vrf_data_by_attempt.get
+    for attempt, signature in tickets:
+        vrf_data = cached_vrf_data(attempt)
+        if vrf_data is None:
+            vrf_data = vrf_data_by_attempt[attempt] = prefix + bytes([attempt])
+        append((vrf_data, b"", signature))
+
+    # Verify the whole batch at once; only failing batches are split
+    errors = {}
+    _bisect_verify(verifier, items, 0, errors)
+
+    # Compute ticket IDs only for signatures that verified
+    ticket_id = compute_ticket_id_bytes
+    return [
+        {"error": errors[i]} if i in errors else {"ok": ticket_id(signature)}
+        for i, (_, _, signature) in enumerate(items)
+    ]
+
+
+def _bisect_verify(verifier, items: list, offset: int, errors: dict):
+    """
+    Verify items in a single call, recursively halving on failure.
+
+    Args:
+        verifier: jam_vrf.RingVerifier
+        items: List of (vrf_data, ad, signature) tuples
+        offset: Index of items[0] in the full batch
+        errors: Filled with {batch_index: error_message} for invalid items
+    """
+    if not items:
+        return
+    try:
+        verifier.verify(items)
+    except Exception as e:
+        if len(items) == 1:
+            errors[offset] = str(e)
+            return
+        mid = len(items) // 2
+        _bisect_verify(verifier, items[:mid], offset, errors)
+        _bisect_verify(verifier, items[mid:], offset + mid, errors)
 
 
 def verify_ring_signature(
@@ -54,31 +194,15 @@ def verify_ring_signature(
     Returns:
         Tuple of (is_valid, ticket_id_hex)
     """
-    # Remove 0x prefix if present
-    if commitment_hex.startswith("0x"):
-        commitment_hex = commitment_hex[2:]
-    if entropy_hex.startswith("0x"):
-        entropy_hex = entropy_hex[2:]
-    if signature_hex.startswith("0x"):
-        signature_hex = signature_hex[2:]
-
-    commitment = bytes.fromhex(commitment_hex)
-    entropy = bytes.fromhex(entropy_hex)
-    signature = bytes.fromhex(signature_hex)
-
-    # Construct VRF input: "jam_ticket_seal" + entropy + attempt
-    data = b"jam_ticket_seal" + entropy + bytes([attempt])
+    commitment = bytes.fromhex(_strip0x(commitment_hex))
+    entropy = bytes.fromhex(_strip0x(entropy_hex))
+    signature = bytes.fromhex(_strip0x(signature_hex))
 
-    # Create verifier
     try:
-        verifier = jam_vrf.RingVerifier(commitment, ring_size)
-
-        # Verify signature
-        verifier.verify([(data, b"", signature)])
-
-        # If we get here, signature is valid - compute ticket ID
-        ticket_id = compute_ticket_id(signature_hex)
-        return (True, ticket_id)
+        ticket_id = verify_ring_signature_bytes(
+            commitment, ring_size, entropy, attempt, signature
+        )
+        return (True, ticket_id.hex())
     except Exception as e:
         # Verification failed
         return (False, str(e))
@@ -91,6 +215,9 @@ if __name__ == "__main__":
         print("Commands:", file=sys.stderr)
         print("  ticket_id <signature_hex>", file=sys.stderr)
         print("  verify <commitment_hex> <ring_size> <entropy_hex> <attempt> <signature_hex>", file=sys.stderr)
+        print("  batch_ticket_ids [--json]  (reads msgpack, or JSON with --json, from stdin)", file=sys.stderr)
+        print("  batch_verify [--json]  (reads msgpack, or JSON with --json, from stdin)", file=sys.stderr)
+        print(f"  daemon [socket_path]  (default {DAEMON_SOCKET_PATH})", file=sys.stderr)
         sys.exit(1)
 
     command = sys.argv[1]
@@ -119,66 +246,64 @@ if __name__ == "__main__":
         print(json.dumps({"valid": is_valid, "result": result}))
 
     elif command == "batch_ticket_ids":
-        # Read signatures from stdin (JSON array)
-        signatures = json.loads(sys.stdin.read())
+        if "--json" in sys.argv[2:]:
+            # Read signatures from stdin (JSON array of hex strings)
+            signatures = json.loads(sys.stdin.read())
+            ticket_id_fn = compute_ticket_id
+        else:
+            # Read signatures from stdin (msgpack array of raw bytes)
+            signatures = msgspec.msgpack.decode(sys.stdin.buffer.read(), type=list[bytes])
+            ticket_id_fn = lambda sig: compute_ticket_id_bytes(sig).hex()
         results = []
+        append = results.append
         for sig in signatures:
             try:
-                ticket_id = compute_ticket_id(sig)
-                results.append({"ok": ticket_id})
+                append({"ok": ticket_id_fn(sig)})
             except Exception as e:
-                results.append({"error": str(e)})
-        print(json.dumps(results))
+                append({"error": str(e)})
+        sys.stdout.buffer.write(msgspec.json.encode(results) + b"\n")
 
     elif command == "batch_verify":
-        # Read verification data from stdin (JSON object)
-        # Format: {"commitment": hex, "ring_size": int, "entropy": hex, "tickets": [{attempt, signature}]}
-        data = json.loads(sys.stdin.read())
-
-        commitment_hex = data["commitment"]
-        ring_size = data["ring_size"]
-        entropy_hex = data["entropy"]
-        tickets = data["tickets"]
-
-        # Remove 0x prefix if present
-        if commitment_hex.startswith("0x"):
-            commitment_hex = commitment_hex[2:]
-        if entropy_hex.startswith("0x"):
-            entropy_hex = entropy_hex[2:]
-
-        commitment = bytes.fromhex(commitment_hex)
-        entropy = bytes.fromhex(entropy_hex)
-
-        # Create verifier
+        if "--json" in sys.argv[2:]:
+            # Read verification data from stdin (JSON object)
+            # Format: {"commitment": hex, "ring_size": int, "entropy": hex, "tickets": [{attempt, signature}]}
+            data = json.loads(sys.stdin.read())
+
+            commitment = bytes.fromhex(_strip0x(data["commitment"]))
+            ring_size = data["ring_size"]
+            entropy = bytes.fromhex(_strip0x(data["entropy"]))
+
+            # Decode signatures once at the CLI boundary
+            decoded = [
+                (t["attempt"], bytes.fromhex(_strip0x(t["signature"])))
+                for t in data["tickets"]
+            ]
+        else:
+            # Read verification data from stdin (msgpack TicketBatchRequest)
+            request = msgspec.msgpack.decode(sys.stdin.buffer.read(), type=TicketBatchRequest)
+            commitment = request.commitment
+            ring_size = request.ring_size
+            entropy = request.entropy
+            decoded = [(t.attempt, t.signature) for t in request.tickets]
+
+        results = batch_verify_tickets(commitment, ring_size, entropy, decoded)
+        for r in results:
+            if "ok" in r:
+                r["ok"] = r["ok"].hex()
+        sys.stdout.buffer.write(msgspec.json.encode(results) + b"\n")
+
+    elif command == "daemon":
+        from helper_daemon import serve
+        socket_path = sys.argv[2] if len(sys.argv) > 2 else DAEMON_SOCKET_PATH
         try:
-            verifier = jam_vrf.RingVerifier(commitment, ring_size)
-        except Exception as e:
-            # Invalid commitment - all tickets fail
-            results = [{"error": f"Invalid commitment: {e}"} for _ in tickets]
-            print(json.dumps(results))
-            sys.exit(0)
-
-        results = []
-        for t in tickets:
-            sig_hex = t["signature"]
-            if sig_hex.startswith("0x"):
-                sig_hex = sig_hex[2:]
-            signature = bytes.fromhex(sig_hex)
-            attempt = t["attempt"]
-
-            # Construct VRF input: "jam_ticket_seal" + entropy + attempt
-            vrf_data = b"jam_ticket_seal" + entropy + bytes([attempt])
-
-            try:
-                # Verify single signature
-                verifier.verify([(vrf_data, b"", signature)])
-                # If valid, compute ticket ID
-                ticket_id = compute_ticket_id(sig_hex)
-                results.append({"ok": ticket_id})
-            except Exception as e:
-                results.append({"error": str(e)})
-
-        print(json.dumps(results))
+            serve({
+                "ticket_id": compute_ticket_id_bytes,
+                "verify": verify_ring_signature_bytes,
+                "batch_verify": batch_verify_tickets,
+            }, socket_path)
+        except RuntimeError as e:
+            print(str(e), file=sys.stderr)
+            sys.exit(1)
 
     else:
         print(f"Unknown command: {command}", file=sys.stderr)
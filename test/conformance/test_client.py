@@ -7,41 +7,63 @@ import sys
 
 SOCKET_PATH = "/tmp/jam_target.sock"
 
+# Reused receive buffer; most responses fit in one recv
+RECV_SCRATCH = bytearray(64 * 1024)
+
 def send_message(sock, data):
     """Send length-prefixed message"""
-    sock.sendall(struct.pack('<I', len(data)))
-    sock.sendall(data)
+    header = struct.pack('<I', len(data))
+    # Prefix and payload in one syscall; finish any partial send with sendall
+    sent = sock.sendmsg([header, data])
+    if sent < len(header):
+        sock.sendall(header[sent:])
+        sent = len(header)
+    if sent - len(header) < len(data):
+        sock.sendall(memoryview(data)[sent - len(header):])
 
 def recv_message(sock):
-    """Receive length-prefixed message"""
-    len_data = sock.recv(4)
-    if len(len_data) < 4:
-        return None
-    msg_len = struct.unpack('<I', len_data)[0]
-    data = b''
-    while len(data) < msg_len:
-        chunk = sock.recv(msg_len - len(data))
-        if not chunk:
+    """Receive length-prefixed message
+
+    Header and payload are read with a single recv when the message fits in
+    the scratch buffer. Assumes lock-step request/response: the target never
+    sends anything after the message we are waiting for.
+    """
+    view = memoryview(RECV_SCRATCH)
+    n = 0
+    while n < 4:
+        got = sock.recv_into(view[n:])
+        if not got:
+            return None
+        n += got
+    msg_len = struct.unpack_from('<I', RECV_SCRATCH)[0]
+    if n >= 4 + msg_len:
+        return bytes(view[4:4 + msg_len])
+
+    # Larger message: keep what we have and top up into a full-size buffer
+    buf = bytearray(msg_len)
+    buf_view = memoryview(buf)
+    pos = n - 4
+    buf_view[:pos] = view[4:n]
+    while pos < msg_len:
+        got = sock.recv_into(buf_view[pos:])
+        if not got:
             return None
-        data += chunk
-    return data
+        pos += got
+    return bytes(buf)
 
 def create_peer_info():
     """Create a PeerInfo message"""
-    msg = bytearray()
-    msg.append(0x00)  # MSG_PEER_INFO
-    msg.append(0x01)  # fuzz_version
-    msg.extend(struct.pack('<I', 0x02))  # features (FORKS)
-    msg.append(0x00)  # jam_version.major
-    msg.append(0x07)  # jam_version.minor
-    msg.append(0x00)  # jam_version.patch
-    msg.append(0x00)  # app_version.major
-    msg.append(0x01)  # app_version.minor
-    msg.append(0x00)  # app_version.patch
     name = b"test_client"
-    msg.append(len(name))
-    msg.extend(name)
-    return bytes(msg)
+    return struct.pack(
+        f'<BBIBBBBBBB{len(name)}s',
+        0x00,               # MSG_PEER_INFO
+        0x01,               # fuzz_version
+        0x02,               # features (FORKS)
+        0x00, 0x07, 0x00,   # jam_version (major, minor, patch)
+        0x00, 0x01, 0x00,   # app_version (major, minor, patch)
+        len(name),          # app_name length
+        name,               # app_name
+    )
 
 def main():
     print(f"Connecting to {SOCKET_PATH}...")
@@ -64,8 +86,8 @@ def main():
             if response[0] == 0x00:
                 print("  Got PeerInfo response")
                 # Parse app_name
-                name_len = response[11]
-                app_name = response[12:12+name_len].decode('utf-8')
+                name_len = struct.unpack_from('<B', response, 11)[0]
+                app_name = struct.unpack_from(f'{name_len}s', response, 12)[0].decode('utf-8')
                 print(f"  App name: {app_name}")
                 print("SUCCESS: Handshake completed!")
         else:
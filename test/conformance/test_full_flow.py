@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Full flow test client for JAM conformance target using pre-computed traces"""
 
+import mmap
 import socket
 import struct
 import sys
@@ -9,24 +10,51 @@ from pathlib import Path
 
 SOCKET_PATH = "/tmp/jam_target.sock"
 
-def send_message(sock, data):
-    """Send length-prefixed message"""
-    sock.sendall(struct.pack('<I', len(data)))
-    sock.sendall(data)
+# Reused receive buffer; most responses fit in one recv
+RECV_SCRATCH = bytearray(64 * 1024)
 
 def recv_message(sock):
-    """Receive length-prefixed message"""
-    len_data = sock.recv(4)
-    if len(len_data) < 4:
-        return None
-    msg_len = struct.unpack('<I', len_data)[0]
-    data = b''
-    while len(data) < msg_len:
-        chunk = sock.recv(msg_len - len(data))
-        if not chunk:
+    """Receive length-prefixed message
+
+    Header and payload are read with a single recv when the message fits in
+    the scratch buffer. Assumes lock-step request/response: the target never
+    sends anything after the message we are waiting for.
+    """
+    view = memoryview(RECV_SCRATCH)
+    n = 0
+    while n < 4:
+        got = sock.recv_into(view[n:])
+        if not got:
             return None
-        data += chunk
-    return data
+        n += got
+    msg_len = struct.unpack_from('<I', RECV_SCRATCH)[0]
+    if n >= 4 + msg_len:
+        return bytes(view[4:4 + msg_len])
+
+    # Larger message: keep what we have and top up into a full-size buffer
+    buf = bytearray(msg_len)
+    buf_view = memoryview(buf)
+    pos = n - 4
+    buf_view[:pos] = view[4:n]
+    while pos < msg_len:
+        got = sock.recv_into(buf_view[pos:])
+        if not got:
+            return None
+        pos += got
+    return bytes(buf)
+
+def send_file_message(sock, f, size):
+    """Send a file as a length-prefixed message (kernel sendfile where available)"""
+    sock.sendall(struct.pack('<I', size))
+    if size:
+        sock.sendfile(f, 0, size)
+
+def map_file(path):
+    """Map a file read-only so it can be compared without copying"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
 def test_with_traces(trace_dir):
     """Test target using pre-computed fuzzer/target trace files"""
@@ -52,15 +80,9 @@ def test_with_traces(trace_dir):
         failed = 0
 
         for fuzzer_file, target_file in zip(fuzzer_files, target_files):
-            # Read fuzzer request
-            with open(fuzzer_file, 'rb') as f:
-                request = f.read()
-
-            # Read expected response
-            with open(target_file, 'rb') as f:
-                expected = f.read()
+            # Map expected response
+            expected = map_file(target_file)
 
-            msg_type = request[0] if request else -1
             type_names = {
                 0x00: "peer_info",
                 0x01: "initialize",
@@ -70,11 +92,17 @@ def test_with_traces(trace_dir):
                 0x05: "state",
                 0xff: "error"
             }
-            msg_name = type_names.get(msg_type, f"unknown({msg_type})")
 
-            print(f"\n[{fuzzer_file.name}] Sending {msg_name} ({len(request)} bytes)...")
+            # Peek the message type, then send the whole file from offset 0
+            # with sendfile on the same handle
+            with open(fuzzer_file, 'rb') as f:
+                request_size = os.fstat(f.fileno()).st_size
+                msg_type = f.read(1)[0] if request_size else -1
+                msg_name = type_names.get(msg_type, f"unknown({msg_type})")
+
+                print(f"\n[{fuzzer_file.name}] Sending {msg_name} ({request_size} bytes)...")
 
-            send_message(sock, request)
+                send_file_message(sock, f, request_size)
             response = recv_message(sock)
 
             if response is None:
@@ -97,7 +125,7 @@ def test_with_traces(trace_dir):
                     print(f"  PASS (peer_info handshake)")
                     passed += 1
                 elif resp_type == 0x02:  # state_root
-                    if response == expected:
+                    if memoryview(response) == expected:
                         print(f"  PASS (state_root matches)")
                         passed += 1
                     else:
@@ -106,7 +134,7 @@ def test_with_traces(trace_dir):
                         print(f"    Expected: 0x{expected[1:33].hex()}")
                         failed += 1
                 else:
-                    if response == expected:
+                    if memoryview(response) == expected:
                         print(f"  PASS (exact match)")
                         passed += 1
                     else:
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Tests for src/crypto/ed25519_helper.py
+
+Run with: python3 -m unittest discover -s test/crypto -p 'test_*.py'
+
+Uses the real ed25519_ffi extension when it is installed and a length-only
+stub otherwise; tests that need real signature checks are skipped without it.
+"""
+
+import struct
+import sys
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src" / "crypto"))
+
+try:
+    import ed25519_ffi
+    HAVE_NATIVE = True
+except ImportError:
+    HAVE_NATIVE = False
+    ed25519_ffi = types.ModuleType("ed25519_ffi")
+
+    class BadSignatureError(Exception):
+        pass
+
+    class VerifyingKey:
+        @staticmethod
+        def from_bytes(public_key):
+            return VerifyingKey()
+
+        def verify_strict(self, message, signature):
+            if signature.startswith(b"bad"):
+                raise BadSignatureError("bad signature")
+
+    ed25519_ffi.BadSignatureError = BadSignatureError
+    ed25519_ffi.VerifyingKey = VerifyingKey
+    ed25519_ffi.batch_verify = lambda items: [
+        len(pk) == 32 and len(sig) == 64 and not sig.startswith(b"bad")
+        for pk, _, sig in items
+    ]
+    sys.modules["ed25519_ffi"] = ed25519_ffi
+
+try:
+    import ed25519_helper
+except ImportError as e:
+    raise unittest.SkipTest(f"ed25519_helper dependencies missing: {e}")
+
+# Identity public key with R = basepoint, s = 1: valid under ZIP-215 for any
+# message, rejected by strict verification (small-order key)
+SMALL_ORDER_PK = bytes([1]) + bytes(31)
+SMALL_ORDER_SIG = (
+    bytes.fromhex("5866666666666666666666666666666666666666666666666666666666666666")
+    + bytes([1]) + bytes(31)
+)
+
+# A = 7B, R = 11B + T and A = 7B + T, R = 11B, with T of order 8 and
+# s = r + H(R, A, M)a: valid under the cofactored batch equation, rejected by
+# strict (cofactorless) verification
+MIXED_ORDER_R_PK = bytes.fromhex("b862409fb5c4c4123df2abf7462b88f041ad36dd6864ce872fd5472be363c5b1")
+MIXED_ORDER_R_SIG = bytes.fromhex(
+    "5b94d525f09dbb3f8bec71da454b8a76c21f9edc1a6b2c8a2650090c0c6a2bd6"
+    "a1b66fb55dec8d2facc52d06c44d6d867b1f872e5e7c493a35040b578cc4c70b"
+)
+MIXED_ORDER_A_PK = bytes.fromhex("16b981d0b88cdf3ab9fa87190822fe4905b475efda3aec7c34abfa92c19320f4")
+MIXED_ORDER_A_SIG = bytes.fromhex(
+    "1337036ac32d8f30d4589c3c1c595812ce0fff40e37c6f5a97ab213f318290ad"
+    "79584e265a258408126da74d7348bdc42b5b34029a001455fa08666af2249e02"
+)
+
+STRICT_REJECTED = {
+    "small_order_key": (SMALL_ORDER_PK, SMALL_ORDER_SIG),
+    "mixed_order_r": (MIXED_ORDER_R_PK, MIXED_ORDER_R_SIG),
+    "mixed_order_key": (MIXED_ORDER_A_PK, MIXED_ORDER_A_SIG),
+}
+
+
+@unittest.skipUnless(HAVE_NATIVE, "ed25519_ffi extension not built")
+class TestStrictConsistency(unittest.TestCase):
+    def test_rejected_by_both_paths(self):
+        message = b"romio"
+        for name, (public_key, signature) in STRICT_REJECTED.items():
+            with self.subTest(name):
+                single = ed25519_helper.verify_ed25519_bytes(public_key, message, signature)
+                batch = ed25519_helper.batch_verify_bytes([(public_key, message, signature)] * 3)
+                self.assertFalse(single)
+                self.assertEqual(batch, [single] * 3)
+
+                hex_single = ed25519_helper.verify_ed25519(
+                    public_key.hex(), message.hex(), signature.hex()
+                )
+                hex_batch = ed25519_helper.batch_verify([{
+                    "public_key": public_key.hex(),
+                    "message": message.hex(),
+                    "signature": signature.hex(),
+                }] * 2)
+                self.assertEqual(hex_batch, [hex_single] * 2)
+
+
+def build_batch_frame(items):
+    frame = bytearray(struct.pack('<BI', ed25519_helper.CMD_BATCH_VERIFY, len(items)))
+    for public_key, message, signature in items:
+        frame += bytes([len(public_key)]) + public_key
+        frame += struct.pack('<I', len(message)) + message
+        frame += bytes([len(signature)]) + signature
+    return bytes(frame)
+
+
+FRAME_ITEMS = [
+    (bytes(range(32)), b"romio", bytes(64)),
+    (b"\xff" * 32, b"", b"\x01" * 64),
+    (b"", b"x" * 300, b""),
+]
+
+
+class TestBatchFrame(unittest.TestCase):
+    def test_roundtrip(self):
+        frame = build_batch_frame(FRAME_ITEMS)
+        self.assertEqual(ed25519_helper.parse_batch_frame(frame), FRAME_ITEMS)
+        self.assertEqual(ed25519_helper.parse_batch_frame(build_batch_frame([])), [])
+
+    def test_truncated_frame_is_rejected(self):
+        frame = build_batch_frame(FRAME_ITEMS)
+        for cut in range(len(frame)):
+            with self.subTest(cut=cut), self.assertRaises(ValueError):
+                ed25519_helper.parse_batch_frame(frame[:cut])
+
+    def test_trailing_bytes_are_rejected(self):
+        frame = build_batch_frame(FRAME_ITEMS)
+        with self.assertRaisesRegex(ValueError, "Trailing bytes"):
+            ed25519_helper.parse_batch_frame(frame + b"\x00")
+
+    def test_wrong_command_is_rejected(self):
+        frame = bytearray(build_batch_frame(FRAME_ITEMS))
+        frame[0] = 0x02
+        with self.assertRaisesRegex(ValueError, "Unexpected frame command"):
+            ed25519_helper.parse_batch_frame(bytes(frame))
+
+    def test_batch_verify_binary_verifies_parsed_items(self):
+        seen = []
+        native = lambda items: seen.extend(items) or [True] * len(items)
+        with mock.patch.object(ed25519_helper, "_native_batch_verify", native):
+            results = ed25519_helper.batch_verify_binary(bytearray(build_batch_frame(FRAME_ITEMS)))
+        self.assertEqual(results, [True] * len(FRAME_ITEMS))
+        self.assertEqual(seen, FRAME_ITEMS)
+
+
+class TestParallelChunks(unittest.TestCase):
+    def setUp(self):
+        self.chunks = []
+
+        def record(items):
+            self.chunks.append(len(items))
+            return [True] * len(items)
+
+        patches = [
+            mock.patch.object(ed25519_helper, "_native_batch_verify", record),
+            mock.patch.object(ed25519_helper.os, "cpu_count", return_value=64),
+            # Start without a pool so the one sized for the fake core count
+            # is only used, and then discarded, by this test
+            mock.patch.object(ed25519_helper, "_executor", None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        if ed25519_helper._executor is not None:
+            ed25519_helper._executor.shutdown()
+
+    def test_small_batch_is_not_split(self):
+        items = [(b"", b"", b"")] * 20
+        self.assertEqual(ed25519_helper._verify_items(items), [True] * 20)
+        self.assertEqual(self.chunks, [20])
+
+    def test_chunks_keep_minimum_size(self):
+        items = [(b"", b"", b"")] * 100
+        self.assertEqual(ed25519_helper._verify_items(items), [True] * 100)
+        self.assertEqual(sorted(self.chunks), [16] * 2 + [17] * 4)
+
+    def test_executor_is_reused(self):
+        items = [(b"", b"", b"")] * 100
+        ed25519_helper._verify_items(items)
+        executor = ed25519_helper._get_executor()
+        ed25519_helper._verify_items(items)
+        self.assertIs(ed25519_helper._get_executor(), executor)
+
+
+if __name__ == "__main__":
+    unittest.main()
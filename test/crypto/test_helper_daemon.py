@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Tests for src/crypto/helper_daemon.py
+
+Run with: python3 -m unittest discover -s test/crypto -p 'test_*.py'
+"""
+
+import os
+import socket
+import stat
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src" / "crypto"))
+
+try:
+    import msgspec
+    import helper_daemon
+except ImportError as e:
+    raise unittest.SkipTest(f"helper_daemon dependencies missing: {e}")
+
+HEADER = helper_daemon.HEADER
+
+
+def recv_exactly(sock, n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        buf += chunk
+    return bytes(buf)
+
+
+def recv_response(sock):
+    msg_len, request_id = HEADER.unpack(recv_exactly(sock, HEADER.size))
+    return request_id, msgspec.msgpack.decode(recv_exactly(sock, msg_len - 4))
+
+
+def send_request(sock, request_id, request):
+    payload = msgspec.msgpack.encode(request)
+    sock.sendall(HEADER.pack(4 + len(payload), request_id) + payload)
+
+
+def start_daemon(handlers, socket_path):
+    """Run the daemon in a background thread and wait until it accepts connections."""
+    threading.Thread(
+        target=helper_daemon.serve,
+        args=(handlers, socket_path, 4),
+        daemon=True,
+    ).start()
+    for _ in range(100):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(socket_path)
+                return
+            except OSError:
+                time.sleep(0.05)
+    raise RuntimeError(f"daemon did not start on {socket_path}")
+
+
+class TestDaemonProtocol(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.socket_path = str(Path(cls.tmpdir.name) / "helper.sock")
+        handlers = {
+            "echo": lambda value: value,
+            "sleep": lambda seconds, value: time.sleep(seconds) or value,
+            "unencodable": lambda: object(),
+        }
+        start_daemon(handlers, cls.socket_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(5)
+        sock.connect(self.socket_path)
+        self.addCleanup(sock.close)
+        return sock
+
+    def assert_rejected(self, msg_len):
+        sock = self.connect()
+        sock.sendall(HEADER.pack(msg_len, 7))
+        request_id, response = recv_response(sock)
+        self.assertEqual(request_id, 7)
+        self.assertIn("Invalid frame length", response["error"])
+        self.assertEqual(sock.recv(1), b"")
+
+    def test_short_frame_length_is_rejected(self):
+        self.assert_rejected(2)
+
+    def test_oversized_frame_length_is_rejected(self):
+        self.assert_rejected(helper_daemon.MAX_FRAME + 1)
+
+    def test_request_roundtrip(self):
+        sock = self.connect()
+        send_request(sock, 1, ["echo", b"romio"])
+        self.assertEqual(recv_response(sock), (1, {"ok": b"romio"}))
+        send_request(sock, 2, ["missing"])
+        self.assertEqual(recv_response(sock), (2, {"error": "Unknown command: missing"}))
+
+    def test_unencodable_result_still_gets_a_response(self):
+        sock = self.connect()
+        send_request(sock, 3, ["unencodable"])
+        request_id, response = recv_response(sock)
+        self.assertEqual(request_id, 3)
+        self.assertIn("Unencodable result", response["error"])
+        send_request(sock, 4, ["echo", 1])
+        self.assertEqual(recv_response(sock), (4, {"ok": 1}))
+
+    def test_responses_are_tagged_with_request_id(self):
+        sock = self.connect()
+        send_request(sock, 1, ["sleep", 0.2, "slow"])
+        send_request(sock, 2, ["echo", "fast"])
+        responses = dict(recv_response(sock) for _ in range(2))
+        self.assertEqual(responses, {1: {"ok": "slow"}, 2: {"ok": "fast"}})
+
+
+
+class TestDaemonSocket(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.socket_path = str(Path(tmpdir.name) / "helper.sock")
+
+    def test_socket_is_private(self):
+        start_daemon({}, self.socket_path)
+        self.assertEqual(stat.S_IMODE(os.stat(self.socket_path).st_mode), 0o600)
+
+    def test_live_daemon_is_not_replaced(self):
+        start_daemon({"echo": lambda value: value}, self.socket_path)
+        with self.assertRaisesRegex(RuntimeError, "already listening"):
+            helper_daemon.serve({}, self.socket_path)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(5)
+            sock.connect(self.socket_path)
+            send_request(sock, 1, ["echo", "still here"])
+            self.assertEqual(recv_response(sock), (1, {"ok": "still here"}))
+
+    def test_stale_socket_is_replaced(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(self.socket_path)
+        start_daemon({}, self.socket_path)
+
+    def test_non_socket_is_not_replaced(self):
+        Path(self.socket_path).write_bytes(b"data")
+        with self.assertRaisesRegex(RuntimeError, "non-socket"):
+            helper_daemon.serve({}, self.socket_path)
+        self.assertEqual(Path(self.socket_path).read_bytes(), b"data")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Tests for src/crypto/vrf_helper.py
+
+Run with: python3 -m unittest discover -s test/crypto -p 'test_*.py'
+
+Ring verification is exercised through a stub verifier, so these tests do not
+need real ring signatures; jam_vrf is stubbed too when it is not installed.
+"""
+
+import sys
+import types
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src" / "crypto"))
+
+try:
+    import jam_vrf  # noqa: F401
+except ImportError:
+    jam_vrf = types.ModuleType("jam_vrf")
+    sys.modules["jam_vrf"] = jam_vrf
+
+try:
+    import vrf_helper
+except ImportError as e:
+    raise unittest.SkipTest(f"vrf_helper dependencies missing: {e}")
+
+
+class StubVerifier:
+    """Rejects any batch containing a signature that starts with b"bad"."""
+
+    def __init__(self):
+        self.calls = []
+
+    def verify(self, items):
+        self.calls.append(len(items))
+        for _, _, signature in items:
+            if signature.startswith(b"bad"):
+                raise ValueError(f"invalid signature {signature!r}")
+
+
+def make_items(signatures):
+    return [(b"jam_ticket_seal", b"", signature) for signature in signatures]
+
+
+class TestBisectVerify(unittest.TestCase):
+    def test_valid_batch_is_one_call(self):
+        verifier = StubVerifier()
+        errors = {}
+        vrf_helper._bisect_verify(verifier, make_items([b"ok"] * 8), 0, errors)
+        self.assertEqual(errors, {})
+        self.assertEqual(verifier.calls, [8])
+
+    def test_mixed_batch_isolates_invalid_items(self):
+        signatures = [b"ok"] * 11
+        for i in (0, 5, 6, 10):
+            signatures[i] = b"bad%d" % i
+        verifier = StubVerifier()
+        errors = {}
+        vrf_helper._bisect_verify(verifier, make_items(signatures), 0, errors)
+        self.assertEqual(sorted(errors), [0, 5, 6, 10])
+        self.assertEqual(errors[5], "invalid signature b'bad5'")
+
+    def test_offset_is_applied(self):
+        errors = {}
+        vrf_helper._bisect_verify(StubVerifier(), make_items([b"ok", b"bad"]), 40, errors)
+        self.assertEqual(list(errors), [41])
+
+    def test_empty_batch(self):
+        verifier = StubVerifier()
+        errors = {}
+        vrf_helper._bisect_verify(verifier, [], 0, errors)
+        self.assertEqual((errors, verifier.calls), ({}, []))
+
+
+class TestBatchVerifyTickets(unittest.TestCase):
+    def setUp(self):
+        self._ring_verifier = vrf_helper._ring_verifier
+        self._ticket_id = vrf_helper._ticket_id
+        vrf_helper._ring_verifier = lambda commitment, ring_size: StubVerifier()
+        vrf_helper._ticket_id = lambda vrf_output: vrf_output[::-1]
+
+    def tearDown(self):
+        vrf_helper._ring_verifier = self._ring_verifier
+        vrf_helper._ticket_id = self._ticket_id
+
+    def test_results_follow_ticket_order(self):
+        tickets = [(0, b"ok-a"), (1, b"bad-b"), (0, b"ok-c")]
+        results = vrf_helper.batch_verify_tickets(b"\x00" * 144, 6, b"\x11" * 32, tickets)
+        self.assertEqual(results, [
+            {"ok": b"a-ko"},
+            {"error": "invalid signature b'bad-b'"},
+            {"ok": b"c-ko"},
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()